@@ -0,0 +1,68 @@
+# fast_neg.py
+# CPU 路径的负边采样：numba JIT 的原生拒绝采样，替代解释器级的逐条采样。
+# numba 是可选依赖，缺失时 HAS_NUMBA=False，由调用方回退到 PyG 的稀疏负采样。
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        return wrap
+
+
+@njit(cache=True)
+def _contains(sorted_arr, key):
+    """二分查找：key 是否在排好序的 int64 数组中"""
+    lo, hi = 0, sorted_arr.shape[0]
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if sorted_arr[mid] < key:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo < sorted_arr.shape[0] and sorted_arr[lo] == key
+
+
+@njit(cache=True)
+def _draw_candidates(existing_sorted, num_nodes, n, seed):
+    """采 n 个打包键 u*N+v（u<v，非自环且不在 existing_sorted 中），可能含重复"""
+    np.random.seed(seed)
+    out = np.empty(n, dtype=np.int64)
+    i = 0
+    while i < n:
+        u = np.random.randint(0, num_nodes)
+        v = np.random.randint(0, num_nodes)
+        if u == v:
+            continue
+        if u > v:
+            u, v = v, u
+        key = u * num_nodes + v
+        if _contains(existing_sorted, key):
+            continue
+        out[i] = key
+        i += 1
+    return out
+
+
+def sample_neg(existing_sorted, num_nodes, k, seed):
+    """
+    采 k 条互不重复的负边，existing_sorted 为排好序的全图正边打包键。
+    内层循环在 numba 原生代码里跑，去重用向量化的 np.unique，
+    返回 [2, k] 的 int64 数组（u<v）。
+    """
+    keys = np.empty(0, dtype=np.int64)
+    attempt = 0
+    while keys.size < k:
+        need = k - keys.size
+        cand = _draw_candidates(existing_sorted, num_nodes,
+                                max(2 * need, 64), seed + attempt)
+        keys = np.unique(np.concatenate([keys, cand]))
+        attempt += 1
+    rng = np.random.default_rng(seed)
+    keys = rng.permutation(keys)[:k]
+    return np.stack([keys // num_nodes, keys % num_nodes])
@@ -71,29 +71,26 @@ def test(model, data, train_data, val_data, test_data, batch_size, args):
     pos_test_edge = test_data.pos_edge_label_index
     neg_test_edge = test_data.neg_edge_label_index
 
-    pos_valid_preds = []
-    for perm in DataLoader(range(pos_valid_edge.size(1)), batch_size):
-        edge = pos_valid_edge[:, perm]
-        pos_valid_preds += [model.edge_decoder(z, edge).squeeze().cpu()]
-    pos_valid_pred = torch.cat(pos_valid_preds, dim=0)
-
-    neg_valid_preds = []
-    for perm in DataLoader(range(neg_valid_edge.size(1)), batch_size):
-        edge = neg_valid_edge[:, perm]
-        neg_valid_preds += [model.edge_decoder(z, edge).squeeze().cpu()]
-    neg_valid_pred = torch.cat(neg_valid_preds, dim=0)
-
-    pos_test_preds = []
-    for perm in DataLoader(range(pos_test_edge.size(1)), batch_size):
-        edge = pos_test_edge[:, perm]
-        pos_test_preds += [model.edge_decoder(z, edge).squeeze().cpu()]
-    pos_test_pred = torch.cat(pos_test_preds, dim=0)
-
-    neg_test_preds = []
-    for perm in DataLoader(range(neg_test_edge.size(1)), batch_size):
-        edge = neg_test_edge[:, perm]
-        neg_test_preds += [model.edge_decoder(z, edge).squeeze().cpu()]
-    neg_test_pred = torch.cat(neg_test_preds, dim=0)
+    # 预分配 CPU 输出张量，按块写入切片，避免 list+torch.cat 的反复小分配
+    pos_valid_pred = torch.empty(pos_valid_edge.size(1))
+    for s in range(0, pos_valid_edge.size(1), batch_size):
+        edge = pos_valid_edge[:, s:s + batch_size]
+        pos_valid_pred[s:s + batch_size] = model.edge_decoder(z, edge).squeeze().to('cpu', non_blocking=True)
+
+    neg_valid_pred = torch.empty(neg_valid_edge.size(1))
+    for s in range(0, neg_valid_edge.size(1), batch_size):
+        edge = neg_valid_edge[:, s:s + batch_size]
+        neg_valid_pred[s:s + batch_size] = model.edge_decoder(z, edge).squeeze().to('cpu', non_blocking=True)
+
+    pos_test_pred = torch.empty(pos_test_edge.size(1))
+    for s in range(0, pos_test_edge.size(1), batch_size):
+        edge = pos_test_edge[:, s:s + batch_size]
+        pos_test_pred[s:s + batch_size] = model.edge_decoder(z, edge).squeeze().to('cpu', non_blocking=True)
+
+    neg_test_pred = torch.empty(neg_test_edge.size(1))
+    for s in range(0, neg_test_edge.size(1), batch_size):
+        edge = neg_test_edge[:, s:s + batch_size]
+        neg_test_pred[s:s + batch_size] = model.edge_decoder(z, edge).squeeze().to('cpu', non_blocking=True)
 
     val_pred = torch.cat([pos_valid_pred, neg_valid_pred], dim=0)
     val_true = torch.cat([torch.ones_like(pos_valid_pred), torch.zeros_like(neg_valid_pred)], dim=0)
@@ -186,18 +183,9 @@ def main():
         train_data, val_data, test_data = transform(data)
     
     train_data.edge_index, _ = add_self_loops(train_data.edge_index, num_nodes=num_nodes)
-    
-    train_edge_index = train_data.edge_index.cpu().numpy().T  # 转换为边列表
-    train_G = nx.Graph()
-    train_G.add_nodes_from(range(data.num_nodes))  # 包含所有节点（但边仅限训练集）
-    train_G.add_edges_from(train_edge_index)
-    
- 
-    data.edge_index = data.edge_index.to(device)
-    data.x = data.x.to(device)
-    train_data.edge_index = train_data.edge_index.to(device)
-    val_data.edge_index = val_data.edge_index.to(device)
-    test_data.edge_index = test_data.edge_index.to(device)
+
+    # 注：T.ToDevice 已把各 split 放到目标设备，这里无需再 .to(device)；
+    # 也不再为构建无用的 train_G 做 .cpu().numpy() 的设备-主机往返
 
     encoder = Encoder(data.x.size(1), args.encoder_channels, model_type=args.model)
     edge_decoder = EdgeDecoder(args.encoder_channels, args.hidden_channels, 1, args.decoder_dropout)
@@ -2,23 +2,21 @@
 import argparse
 import os
 import time
-import random
 import numpy as np
 import pandas as pd
-import networkx as nx
 import datetime
 
 import torch
 import torch.nn.functional as F
 from torch_geometric.data import Data
 import torch_geometric.transforms as T
-from torch_geometric.loader import DataLoader
 from torch_geometric.utils import negative_sampling, add_self_loops
 from torch_geometric.utils import degree
 from sklearn.metrics import roc_auc_score, average_precision_score
 from sklearn.model_selection import KFold
 
 from model import Encoder, EdgeDecoder, EncoderDecoder
+import fast_neg
 
 
 # -------------------- 评价、训练、测试（与你一致） --------------------
@@ -33,26 +31,50 @@ def evaluate_auc(val_pred, val_true, test_pred, test_true):
     return results
 
 
-def train(model, data, train_data, optimizer, lr_scheduler, args, epoch):
+def train(model, data, train_data, optimizer, lr_scheduler, args, epoch,
+          perm_buf=None, aug_edge_index=None):
     model.train()
     remaining_edges, masked_edges = train_data.edge_index, train_data.edge_index
 
     # 训练阶段：基于“全图 + 自环”的边进行在线负采样
-    aug_edge_index, _ = add_self_loops(data.edge_index)
+    # （全图不变，aug_edge_index 由调用方算一次传入，免去每 epoch 的 cat+分配）
+    if aug_edge_index is None:
+        aug_edge_index, _ = add_self_loops(data.edge_index)
     neg_edges = negative_sampling(
         aug_edge_index,
         num_nodes=data.x.size(0),
         num_neg_samples=masked_edges.view(2, -1).size(1),
     ).view_as(masked_edges)
 
-    for perm in DataLoader(range(masked_edges.size(1)), args.batch_size, shuffle=True):
+    # Ampere+ 上用 BF16 autocast 跑前向（tensor core 吞吐翻倍），损失仍回 FP32 算
+    amp_enabled = data.x.is_cuda and torch.cuda.is_bf16_supported()
+
+    # 设备上 randperm 一次 + 切片，代替 DataLoader(range(E)) 的逐 batch Python 迭代
+    # perm_buf 由调用方每折预分配，randperm(out=) 原地重填，切片是视图不产生新分配
+    E = masked_edges.size(1)
+    if perm_buf is None:
+        perm_buf = torch.empty(E, dtype=torch.long, device=masked_edges.device)
+    torch.randperm(E, out=perm_buf)
+
+    # 标签形状由 batch 大小唯一决定：整批 + 尾批各预建一份，循环内零分配
+    dev = masked_edges.device
+    bs = min(args.batch_size, E)
+    labels_full = torch.cat([torch.ones(bs, device=dev), torch.zeros(bs, device=dev)])
+    rem = E % args.batch_size if E > args.batch_size else 0
+    labels_rem = (torch.cat([torch.ones(rem, device=dev), torch.zeros(rem, device=dev)])
+                  if rem else labels_full)
+
+    for s in range(0, E, args.batch_size):
+        perm = perm_buf[s:s + args.batch_size]
         optimizer.zero_grad()
-        z = model.encoder(data.x, remaining_edges)
-        pos_scores = model.edge_decoder(z, masked_edges[:, perm])
-        neg_scores = model.edge_decoder(z, neg_edges[:, perm])
+        with torch.autocast(device_type='cuda', dtype=torch.bfloat16, enabled=amp_enabled):
+            z = model.encoder(data.x, remaining_edges)
+            # 正负边拼成一个 batch，解码器直接出 logits，单次 BCE-with-logits 完成两路损失
+            edge = torch.cat([masked_edges[:, perm], neg_edges[:, perm]], dim=1)
+            logits = model.edge_decoder(z, edge, return_logits=True).squeeze()
+        labels = labels_full if perm.numel() == bs else labels_rem
 
-        loss = F.binary_cross_entropy(pos_scores, torch.ones_like(pos_scores))
-        loss += F.binary_cross_entropy(neg_scores, torch.zeros_like(neg_scores))
+        loss = F.binary_cross_entropy_with_logits(logits.float(), labels)
 
         loss.backward()
         torch.nn.utils.clip_grad_norm_(model.parameters(), 1.0)
@@ -63,26 +85,35 @@ def train(model, data, train_data, optimizer, lr_scheduler, args, epoch):
 
 
 @torch.no_grad()
-def test(model, data, train_data, val_data, test_data, batch_size, args):
+def compute_scores(model, data, train_data, val_data, test_data, batch_size):
+    """
+    评估的 GPU 侧：算出四组预测并留在设备上（不触发主机同步），
+    便于调用方把这部分发到副 CUDA 流、与其他折的训练重叠。
+    """
     model.eval()
-    z = model.encoder(data.x, train_data.edge_index)
-
-    pos_valid_edge = val_data.pos_edge_label_index
-    neg_valid_edge = val_data.neg_edge_label_index
-    pos_test_edge = test_data.pos_edge_label_index
-    neg_test_edge = test_data.neg_edge_label_index
-
-    def batched_scores(edge_idx):
-        preds = []
-        for perm in DataLoader(range(edge_idx.size(1)), batch_size):
-            edge = edge_idx[:, perm]
-            preds += [model.edge_decoder(z, edge).squeeze().cpu()]
-        return torch.cat(preds, dim=0) if preds else torch.empty(0)
-
-    pos_valid_pred = batched_scores(pos_valid_edge)
-    neg_valid_pred = batched_scores(neg_valid_edge)
-    pos_test_pred = batched_scores(pos_test_edge)
-    neg_test_pred = batched_scores(neg_test_edge)
+    amp_enabled = data.x.is_cuda and torch.cuda.is_bf16_supported()
+    with torch.autocast(device_type='cuda', dtype=torch.bfloat16, enabled=amp_enabled):
+        z = model.encoder(data.x, train_data.edge_index)
+
+    def scores(edge):
+        # 放得下就一次算完；否则按 batch_size 切块，避免 DataLoader 的 Python 迭代开销
+        # （autocast 下解码器出 BF16，这里先转回 FP32，落 CPU 留给 finalize_results）
+        with torch.autocast(device_type='cuda', dtype=torch.bfloat16, enabled=amp_enabled):
+            if edge.size(1) <= batch_size:
+                return model.edge_decoder(z, edge).squeeze().float()
+            return torch.cat([model.edge_decoder(z, edge[:, s:s + batch_size]).squeeze().float()
+                              for s in range(0, edge.size(1), batch_size)])
+
+    return (scores(val_data.pos_edge_label_index),
+            scores(val_data.neg_edge_label_index),
+            scores(test_data.pos_edge_label_index),
+            scores(test_data.neg_edge_label_index))
+
+
+def finalize_results(score_tuple):
+    """评估的 CPU 侧：取回预测并计算 AUC/AP（此处才发生设备到主机的拷贝）"""
+    pos_valid_pred, neg_valid_pred, pos_test_pred, neg_test_pred = \
+        [t.cpu() for t in score_tuple]
 
     val_pred = torch.cat([pos_valid_pred, neg_valid_pred], dim=0)
     val_true = torch.cat([torch.ones_like(pos_valid_pred), torch.zeros_like(neg_valid_pred)], dim=0)
@@ -90,111 +121,121 @@ def test(model, data, train_data, val_data, test_data, batch_size, args):
     test_pred = torch.cat([pos_test_pred, neg_test_pred], dim=0)
     test_true = torch.cat([torch.ones_like(pos_test_pred), torch.zeros_like(neg_test_pred)], dim=0)
 
-    results = evaluate_auc(val_pred, val_true, test_pred, test_true)
-    return results
-# -------------------------------------------------------------------
+    return evaluate_auc(val_pred, val_true, test_pred, test_true)
 
 
-# -------------------- 小工具 --------------------
-def make_undirected_unique_edges(G):
-    """将无向边标准化为 (u<v) 并去重"""
-    edges = []
-    for u, v in G.edges():
-        a, b = (u, v) if u < v else (v, u)
-        edges.append((a, b))
-    return sorted(list(set(edges)))
+def test(model, data, train_data, val_data, test_data, batch_size, args):
+    return finalize_results(
+        compute_scores(model, data, train_data, val_data, test_data, batch_size))
+# -------------------------------------------------------------------
 
 
+# -------------------- 小工具 --------------------
 def to_index_tensor(edge_list, device):
-    """[(u,v)] -> tensor shape [2, E]"""
-    if not edge_list:
+    """[(u,v)] 或 [E,2] ndarray -> tensor shape [2, E]"""
+    arr = np.asarray(edge_list, dtype=np.int64)
+    if arr.size == 0:
         return torch.empty((2, 0), dtype=torch.long, device=device)
-    arr = np.array(edge_list, dtype=np.int64).T
-    return torch.from_numpy(arr).long().to(device)
+    return torch.from_numpy(np.ascontiguousarray(arr.T)).to(device)
 
 
 def bidir_edge_index(edge_list, device):
-    """[(u,v)] -> 双向 edge_index tensor shape [2, 2E]"""
-    if not edge_list:
+    """[(u,v)] 或 [E,2] ndarray -> 双向 edge_index tensor shape [2, 2E]"""
+    arr = np.asarray(edge_list, dtype=np.int64)
+    if arr.size == 0:
         return torch.empty((2, 0), dtype=torch.long, device=device)
-    bi = []
-    for u, v in edge_list:
-        bi.append((u, v))
-        bi.append((v, u))
-    arr = np.array(bi, dtype=np.int64).T
-    return torch.from_numpy(arr).long().to(device)
+    arr = np.ascontiguousarray(arr.T)  # [2, E]
+    bi = np.concatenate([arr, arr[::-1]], axis=1)  # 翻转行即 (v,u)
+    return torch.from_numpy(bi).to(device)
+
+
+def _pack_canonical(edge_index, num_nodes):
+    """[2, E] 负边规范化为 u<v 后打包成 u*N+v 键（解码器打分对方向对称）"""
+    lo = torch.minimum(edge_index[0], edge_index[1])
+    hi = torch.maximum(edge_index[0], edge_index[1])
+    return lo * num_nodes + hi
+
+
+def sample_cv_negatives(edge_index, num_nodes, n_neg):
+    """
+    用 PyG 的稀疏负采样（C 后端）一次性拿 n_neg 条负边。
+    PyG 返回的是有向负边，先规范化为 u<v 再打包为 u*N+v，
+    unique 去重（同一非边的两个方向只留一条），不足的缺口再补采，
+    最后随机取 n_neg 条还原为 [2, n_neg] 的 edge_index。
+    """
+    neg = negative_sampling(edge_index, num_nodes=num_nodes,
+                            num_neg_samples=n_neg, method='sparse')
+    packed = torch.unique(_pack_canonical(neg, num_nodes))
+    while packed.numel() < n_neg:
+        extra = negative_sampling(edge_index, num_nodes=num_nodes,
+                                  num_neg_samples=n_neg - packed.numel(),
+                                  method='sparse')
+        packed = torch.unique(torch.cat([packed, _pack_canonical(extra, num_nodes)]))
+    perm = torch.randperm(packed.numel(), device=packed.device)[:n_neg]
+    packed = packed[perm]
+    return torch.stack([packed // num_nodes, packed % num_nodes])
 # -------------------------------------------------------------------
 
 
 # -------------------- 五折交叉主流程 --------------------
-def link_prediction_cross_validation(G, data_full, args, device):
+def link_prediction_cross_validation(undirected_edges, data_full, args, device):
     """
-    给定 NetworkX 全图 G 与 PyG 全图 data_full（x=1，edge_index=全边双向），
-    在正样本边上做 5 折交叉：每折 4 份边组成训练图（再切 10% 做验证），1 份边作测试正样本；
-    验证/测试负样本来自非边随机采样（同量）。
+    给定去重后的无向边数组 undirected_edges（[E,2]，u<v）与 PyG 全图 data_full
+    （edge_index=全边双向），在正样本边上做 5 折交叉：每折 4 份边组成训练图
+    （再切 10% 做验证），1 份边作测试正样本；验证/测试负样本来自非边随机采样（同量）。
     """
-    all_positive_edges = make_undirected_unique_edges(G)  # u<v
+    all_positive_edges = undirected_edges  # [E,2] int64，u<v，全程保持数组形态
     kf = KFold(n_splits=5, shuffle=True, random_state=42)
 
     patience = int((args.epochs / args.t) / 2)
     rng_global = np.random.default_rng(42)
-    nodes = list(G.nodes())
-    existing_edges = set(all_positive_edges)  # 全图正边集合（u<v）
+    num_nodes = data_full.num_nodes
+
+    # 全图 + 自环：训练期在线负采样用，所有折所有 epoch 共享，只算一次
+    aug_edge_index, _ = add_self_loops(data_full.edge_index)
+
+    # CPU 跑且装了 numba 时，负采样走原生 JIT 的拒绝采样（见 fast_neg.py）
+    use_numba_neg = device == 'cpu' and fast_neg.HAS_NUMBA
+    if use_numba_neg:
+        existing_packed = np.sort(all_positive_edges[:, 0] * num_nodes
+                                  + all_positive_edges[:, 1])
 
     fold_rows = []
     model_key = args.model
     test_auc_list, test_ap_list = [], []
 
+    # === 先构建全部 5 折的数据与模型，再用一个 epoch 循环交替推进各折 ===
+    # 小图上单折每步 GPU 利用率很低，顺序跑 5 折浪费设备；5 个独立模型在
+    # 同一 epoch 内依次发射 kernel，可以把发射/调度间隙填满。
+    folds = []
     for fold, (train_idx, test_idx) in enumerate(kf.split(all_positive_edges), start=1):
-        print(f"\n----- Fold {fold}/5 -----")
-
-        # === 1) 正样本划分 ===
-        train_pos_edges = [all_positive_edges[i] for i in train_idx]
-        test_pos_edges = [all_positive_edges[i] for i in test_idx]
-
-        # === 2) 训练子图（仅含 train_pos，避免信息泄漏）===
-        G_train = nx.Graph()
-        G_train.add_nodes_from(G.nodes())
-        G_train.add_edges_from(train_pos_edges)
+        # === 1) 正样本划分（数组花式索引，无 Python 元组物化）===
+        train_pos_edges = all_positive_edges[train_idx]
+        test_pos_edges = all_positive_edges[test_idx]
 
         # === 3) 负样本（来自非边；与对应正样本数量一致）===
-        # 测试负样本
-        test_neg_edges, test_neg_set = [], set()
-        while len(test_neg_edges) < len(test_pos_edges):
-            u = random.choice(nodes)
-            v = random.choice(nodes)
-            if u == v:
-                continue
-            pair = (u, v) if u < v else (v, u)
-            if pair in existing_edges or pair in test_neg_set:
-                continue
-            test_neg_set.add(pair)
-            test_neg_edges.append((u, v))
-
-        # 训练负样本
-        train_neg_edges, train_neg_set = [], set()
-        while len(train_neg_edges) < len(train_pos_edges):
-            u = random.choice(nodes)
-            v = random.choice(nodes)
-            if u == v:
-                continue
-            pair = (u, v) if u < v else (v, u)
-            if pair in existing_edges or pair in train_neg_set or pair in test_neg_set:
-                continue
-            train_neg_set.add(pair)
-            train_neg_edges.append((u, v))
+        # 一次采满本折所需负边，再切成测试 / 训练两段（unique 保证互不重叠）
+        n_test = len(test_pos_edges)
+        n_neg = len(train_pos_edges) + n_test
+        if use_numba_neg:
+            neg_edges = torch.from_numpy(
+                fast_neg.sample_neg(existing_packed, num_nodes, n_neg, 42 + fold))
+        else:
+            neg_edges = sample_cv_negatives(data_full.edge_index, num_nodes, n_neg)
+        test_neg_edges = neg_edges[:, :n_test]
+        train_neg_edges = neg_edges[:, n_test:]
 
         # === 4) 从训练正样本切 10% 做验证（负样本同步切）===
         rng = np.random.default_rng(42 + fold)
         rng.shuffle(train_pos_edges)
-        rng.shuffle(train_neg_edges)
         n_val = max(1, int(0.10 * len(train_pos_edges)))
 
         val_pos_edges = train_pos_edges[:n_val]
         final_train_pos = train_pos_edges[n_val:]
 
-        val_neg_edges = train_neg_edges[:n_val]
-        # final_train_neg = train_neg_edges[n_val:]  # 训练阶段你是在线负采样，这里不再使用
+        # 负样本本身即随机顺序，直接切前 n_val 条做验证
+        val_neg_edges = train_neg_edges[:, :n_val]
+        # final_train_neg = train_neg_edges[:, n_val:]  # 训练阶段是在线负采样，这里不再使用
 
         # === 5) 组装 PyG 数据对象 ===
         # 训练图：仅含最终训练正边（双向）
@@ -203,11 +244,11 @@ def link_prediction_cross_validation(G, data_full, args, device):
         # 验证/测试集：各自的正/负边索引（注意是 u,v 不需要双向）
         val_data = Data()
         val_data.pos_edge_label_index = to_index_tensor(val_pos_edges, device)
-        val_data.neg_edge_label_index = to_index_tensor(val_neg_edges, device)
+        val_data.neg_edge_label_index = val_neg_edges
 
         test_data = Data()
         test_data.pos_edge_label_index = to_index_tensor(test_pos_edges, device)
-        test_data.neg_edge_label_index = to_index_tensor(test_neg_edges, device)
+        test_data.neg_edge_label_index = test_neg_edges
 
         # === 6) 模型、训练、评估 ===
         encoder = Encoder(data_full.x.size(1), args.encoder_channels, model_type=model_key)
@@ -215,57 +256,136 @@ def link_prediction_cross_validation(G, data_full, args, device):
         model = EncoderDecoder(encoder, edge_decoder).to(device)
 
         model.reset_parameters()
+
+        # 可选：torch.compile 降低小图上的 dispatcher / kernel launch 开销
+        # （每折内形状固定，reduce-overhead 模式可走 CUDA Graphs 捕获）
+        if args.compile:
+            model.encoder = torch.compile(model.encoder, mode='reduce-overhead', fullgraph=False)
+            model.edge_decoder = torch.compile(model.edge_decoder, mode='reduce-overhead', fullgraph=False)
+        else:
+            # 默认用 TorchScript 脚本化解码器：gather/mul/mish/dropout 这串小算子
+            # 每个都是一次 dispatcher 往返，脚本化后由 JIT 做逐点融合
+            model.edge_decoder = torch.jit.script(model.edge_decoder)
+
         optimizer = torch.optim.Adam(params=model.parameters(), lr=args.lr)
         lr_scheduler = torch.optim.lr_scheduler.CosineAnnealingLR(optimizer, T_max=int(args.epochs / args.t))
 
         # 训练图加自环（与 GCNConv(add_self_loops=False) 对应）
         train_data.edge_index, _ = add_self_loops(train_data.edge_index, num_nodes=data_full.num_nodes)
 
-        best_valid_AUC, best_epoch, cnt_wait = 0.0, 0, 0
-        best_state = None
+        # 训练 shuffle 用的索引缓冲：每折一次分配，各 epoch 原地重填
+        perm_buf = torch.empty(train_data.edge_index.size(1), dtype=torch.long, device=device)
+
+        # 最优权重的 CPU 镜像：每折分配一次（CUDA 下用 pinned memory），
+        # 提升时 copy_(non_blocking=True) 异步回传，不再整份同步拷贝 state_dict
+        cpu_mirror = {k: torch.empty_like(v, device='cpu')
+                      for k, v in model.state_dict().items()}
+        if torch.cuda.is_available():
+            cpu_mirror = {k: v.pin_memory() for k, v in cpu_mirror.items()}
+
+        folds.append({
+            'fold': fold,
+            'model': model,
+            'optimizer': optimizer,
+            'lr_scheduler': lr_scheduler,
+            'train_data': train_data,
+            'val_data': val_data,
+            'test_data': test_data,
+            'cpu_mirror': cpu_mirror,
+            'perm_buf': perm_buf,
+            'best_valid_AUC': 0.0,
+            'best_epoch': 0,
+            'cnt_wait': 0,
+            'done': False,
+        })
+
+    # 评估用副流：第 i 折的打分 kernel 与第 i+1 折的训练前向重叠
+    eval_stream = torch.cuda.Stream() if torch.cuda.is_available() else None
 
-        for epoch in range(1, args.epochs + 1):
+    # === 单个 epoch 循环推进所有未收敛的折 ===
+    for epoch in range(1, args.epochs + 1):
+        active = [fb for fb in folds if not fb['done']]
+        if not active:
+            break
+
+        # 先推进各折的训练并把评估发射出去，指标统一在同步后计算
+        pending = []
+        for fb in active:
             t1 = time.time()
-            loss = train(model, data_full, train_data, optimizer, lr_scheduler, args, epoch)
+            loss = train(fb['model'], data_full, fb['train_data'],
+                         fb['optimizer'], fb['lr_scheduler'], args, epoch,
+                         perm_buf=fb['perm_buf'], aug_edge_index=aug_edge_index)
             t2 = time.time()
-            results = test(model, data_full, train_data, val_data, test_data, args.batch_size, args)
+
+            if eval_stream is not None:
+                eval_stream.wait_stream(torch.cuda.current_stream())
+                with torch.cuda.stream(eval_stream):
+                    score_t = compute_scores(fb['model'], data_full, fb['train_data'],
+                                             fb['val_data'], fb['test_data'], args.batch_size)
+            else:
+                score_t = compute_scores(fb['model'], data_full, fb['train_data'],
+                                         fb['val_data'], fb['test_data'], args.batch_size)
+            pending.append((fb, loss, t2 - t1, score_t))
+
+        # 一次同步，保证本 epoch 所有折的打分都已完成（下个 epoch 才会改权重）
+        if eval_stream is not None:
+            eval_stream.synchronize()
+
+        for fb, loss, train_time, score_t in pending:
+            results = finalize_results(score_t)
 
             valid_AUC = results['AUC'][0]
             valid_AP = results['AP'][0]
             test_AUC = results['AUC'][1]
             test_AP = results['AP'][1]
 
-            print(f'Epoch {epoch:04d}/{args.epochs:04d} | Loss {loss:.4f} | '
+            print(f'Fold {fb["fold"]} | Epoch {epoch:04d}/{args.epochs:04d} | Loss {loss:.4f} | '
                   f'Valid AUC/AP {valid_AUC:.2%}/{valid_AP:.2%} | '
                   f'Test AUC/AP {test_AUC:.2%}/{test_AP:.2%} | '
-                  f'{t2 - t1:.3f}s')
-
-            if valid_AUC > best_valid_AUC:
-                best_valid_AUC = valid_AUC
-                best_epoch = epoch
-                best_state = {k: v.detach().cpu().clone() for k, v in model.state_dict().items()}
-                cnt_wait = 0
+                  f'{train_time:.3f}s')
+
+            if valid_AUC > fb['best_valid_AUC']:
+                fb['best_valid_AUC'] = valid_AUC
+                fb['best_epoch'] = epoch
+                for k, v in fb['model'].state_dict().items():
+                    fb['cpu_mirror'][k].copy_(v, non_blocking=True)
+                fb['cnt_wait'] = 0
             else:
-                cnt_wait += 1
-
-            if cnt_wait == patience:
-                print('Early stopping!')
-                break
-
-        if best_state is not None:
-            model.load_state_dict(best_state)
-
-        final = test(model, data_full, train_data, val_data, test_data, args.batch_size, args)
+                fb['cnt_wait'] += 1
+
+            if fb['cnt_wait'] == patience:
+                print(f'Fold {fb["fold"]}: Early stopping!')
+                fb['done'] = True
+
+    # === 各折恢复最优权重并做最终评估 ===
+    for fb in folds:
+        fold, model = fb['fold'], fb['model']
+        if fb['best_epoch'] > 0:
+            if torch.cuda.is_available():
+                torch.cuda.synchronize()  # 等异步回传完成再恢复
+            model.load_state_dict(fb['cpu_mirror'])
+
+        # 最终评估是纯前向：整模型 TorchScript 化吃 JIT 的融合优化；
+        # PyG 算子在部分版本下不可脚本化，失败则回退 eager（--compile 下保持原样）
+        eval_model = model
+        if not args.compile:
+            try:
+                eval_model = torch.jit.script(model).eval()
+            except Exception:
+                eval_model = model
+
+        final = test(eval_model, data_full, fb['train_data'], fb['val_data'],
+                     fb['test_data'], args.batch_size, args)
         fold_rows.append({
             'fold': fold,
             'valid_auc': final['AUC'][0],
             'test_auc': final['AUC'][1],
             'valid_ap': final['AP'][0],
             'test_ap': final['AP'][1],
-            'best_epoch': best_epoch
+            'best_epoch': fb['best_epoch']
         })
 
-        print(f'**** Fold {fold} | Best Epoch {best_epoch:04d} | '
+        print(f'**** Fold {fold} | Best Epoch {fb["best_epoch"]:04d} | '
               f'Valid AUC/AP {final["AUC"][0]:.2%}/{final["AP"][0]:.2%} | '
               f'Test AUC/AP {final["AUC"][1]:.2%}/{final["AP"][1]:.2%}')
         test_auc_list.append(final['AUC'][1])
@@ -303,6 +423,8 @@ def main():
     parser.add_argument('--t', type=int, default=2)
     parser.add_argument('--runs', type=int, default=2)
     parser.add_argument('--model', type=str, choices=['gcn', 'gat', 'graphsage'])
+    parser.add_argument('--compile', action='store_true',
+                        help='torch.compile encoder/decoder (reduce-overhead)')
     args = parser.parse_args()
 
     patience = int((args.epochs / args.t) * 0.1)
@@ -315,25 +437,26 @@ def main():
     if torch.cuda.is_available():
         print("GPU:", torch.cuda.get_device_name(args.device))
 
-    # ====== 读取仅含连边的图；节点属性置为 1 ======
+    # ====== 读取仅含连边的图；NumPy 向量化加载 ======
     dataset_name = args.dataset
     edges_file_path = f"norm_dataset/{dataset_name}_edges.txt"
-    G = nx.read_edgelist(edges_file_path, nodetype=int)
-
-    # 节点 ID 重映射到 0..N-1
-    node_order = sorted(G.nodes())
-    remap = {node: idx for idx, node in enumerate(node_order)}
-    G = nx.relabel_nodes(G, remap)
-
-    # 构造 PyG Data（全图：双向 edge_index + x=全1）
-    undirected_edges = make_undirected_unique_edges(G)
-    bidir_edges = []
-    for u, v in undirected_edges:
-        bidir_edges.append((u, v))
-        bidir_edges.append((v, u))
-    edge_index_full = torch.tensor(bidir_edges, dtype=torch.long).t().contiguous()
-    deg = degree(edge_index_full[0], num_nodes=G.number_of_nodes()) 
-    x = torch.log1p(deg).view(-1, 1).to(torch.float32) 
+    raw = np.loadtxt(edges_file_path, dtype=np.int64).reshape(-1, 2)
+
+    # 节点 ID 重映射到 0..N-1（np.unique 即按 ID 升序连续编号）
+    node_ids, inv = np.unique(raw.reshape(-1), return_inverse=True)
+    edges = inv.reshape(raw.shape)
+    num_nodes = node_ids.size
+
+    # 规范化为 u<v，打包键 u*N+v 去重
+    a = np.minimum(edges[:, 0], edges[:, 1])
+    b = np.maximum(edges[:, 0], edges[:, 1])
+    packed = np.unique(a * num_nodes + b)
+    undirected_edges = np.stack([packed // num_nodes, packed % num_nodes], axis=1)  # [E,2]
+
+    # 构造 PyG Data（全图：双向 edge_index）
+    edge_index_full = bidir_edge_index(undirected_edges, 'cpu')
+    deg = degree(edge_index_full[0], num_nodes=num_nodes)
+    x = torch.log1p(deg).view(-1, 1).to(torch.float32)
     data_full = Data(x=x, edge_index=edge_index_full)
 
     #x = torch.ones((G.number_of_nodes(), 1), dtype=torch.float)
@@ -344,7 +467,7 @@ def main():
     all_runs = []
     for run in range(args.runs):
         print(f"\n===== Run {run + 1}/{args.runs} =====")
-        results = link_prediction_cross_validation(G, data_full, args, device)
+        results = link_prediction_cross_validation(undirected_edges, data_full, args, device)
         row = {
             'run': run + 1,
             'test_auc_mean': results['test_auc_mean'],
@@ -60,15 +60,20 @@ class EdgeDecoder(torch.nn.Module):
         self.fc1.reset_parameters()
         self.fc2.reset_parameters()
 
-    def forward(self, z, edge):
+    # bool 注解保证 torch.jit.script 可整体脚本化本模块
+    def forward(self, z, edge, return_logits: bool = False):
          # 将两个节点嵌入相乘，用两个节点嵌入的 Hadamard 积表示连接特征。
-        x = z[edge[0]] * z[edge[1]]
+        # index_select 走专用 gather kernel，避免高级索引的通用路径
+        x = torch.mul(z.index_select(0, edge[0]), z.index_select(0, edge[1]))
         x = self.fc1(x)
         x = self.dropout(x)
         # 使用 Mish 激活函数
         x = F.mish(x)
         x = self.fc2(x)
         x = self.dropout(x)
+        # 训练时可直接返回 logits，配合 BCE-with-logits 省掉 sigmoid 核并更数值稳定
+        if return_logits:
+            return x
         # 用 Sigmoid 得到连接概率
         probs = torch.sigmoid(x)
         return probs